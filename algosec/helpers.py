@@ -52,6 +52,12 @@ def mount_adapter_on_session(session, adapter):
     session.mount("http://", adapter)
 
 
+# Shape of everything IPv4Network may accept: an address, optionally followed by a prefix length or a mask.
+# Used to reject object names without paying for IPv4Network's exception path.
+_IPV4_ADDRESS_SHAPE = '[0-9]{1,3}(?:\\.[0-9]{1,3}){3}'
+_IP_OR_SUBNET_SHAPE_REGEX = re.compile('{0}(?:/(?:[0-9]+|{0}))?\\Z'.format(_IPV4_ADDRESS_SHAPE))
+
+
 def is_ip_or_subnet(string):
     """Return true if the given string if an IPv4 address or a subnet.
 
@@ -63,7 +69,11 @@ def is_ip_or_subnet(string):
     """
     try:
         # string must be unicode for this package
-        IPv4Network(six.text_type(string))
+        string = six.text_type(string)
+        if not _IP_OR_SUBNET_SHAPE_REGEX.match(string):
+            return False
+        # IPv4Network stays the source of truth for octet ranges, prefix lengths and host bits
+        IPv4Network(string)
         return True
     except (AddressValueError, NetmaskValueError, ValueError):
         return False
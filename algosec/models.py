@@ -124,20 +124,31 @@ class DeviceAllowanceState(Enum):
         Returns:
             DeviceAllowanceState: The relevant enum matching the given string.
         """
-        if string.lower().startswith("partially"):
-            return cls.PARTIALLY_BLOCKED
-        elif string.lower().startswith("blocked"):
-            return cls.BLOCKED
-        elif string.lower().startswith("allowed"):
-            return cls.ALLOWED
-        elif string.lower().startswith("not routed"):
-            return cls.NOT_ROUTED
-        else:
-            raise UnrecognizedAllowanceState(
-                "Unable to get DeviceAllowanceState from string state: {}".format(
-                    string
-                )
+        lowered_string = string.lower()
+        state = _DEVICE_ALLOWANCE_STATE_BY_TEXT.get(lowered_string)
+        if state is not None:
+            return state
+        for prefix, state in _DEVICE_ALLOWANCE_STATE_PREFIXES:
+            if lowered_string.startswith(prefix):
+                return state
+        raise UnrecognizedAllowanceState(
+            "Unable to get DeviceAllowanceState from string state: {}".format(
+                string
             )
+        )
+
+
+# Lookup tables for DeviceAllowanceState.from_string. Kept outside of the enum since any attribute
+# defined in its body would become a member. The exact texts, and the server's "Partially Allowed"
+# wording, are the fast path. The prefixes are checked in order for any other wording of the states.
+_DEVICE_ALLOWANCE_STATE_BY_TEXT = {state.value.text.lower(): state for state in DeviceAllowanceState}
+_DEVICE_ALLOWANCE_STATE_BY_TEXT["partially allowed"] = DeviceAllowanceState.PARTIALLY_BLOCKED
+_DEVICE_ALLOWANCE_STATE_PREFIXES = (
+    ("partially", DeviceAllowanceState.PARTIALLY_BLOCKED),
+    ("blocked", DeviceAllowanceState.BLOCKED),
+    ("allowed", DeviceAllowanceState.ALLOWED),
+    ("not routed", DeviceAllowanceState.NOT_ROUTED),
+)
 
 
 ChangeRequestActionInfo = namedtuple("ChangeRequestActionInfo", ["api_value", "text"])
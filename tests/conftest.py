@@ -1,11 +1,8 @@
 import os
 from typing import Callable
 
-import pytest
 import vcr
 
-from algosec.api_clients.fire_flow import FireFlowAPIClient
-
 ALGOSEC_VERIFY_SSL = False
 ALGOSEC_LOGIN_PASSWORD = 'algosec'
 ALGOSEC_LOGIN_USERNAME = 'admin'
@@ -28,16 +25,6 @@ def cassette_filename_generator(test_function):  # type: (Callable) -> str
 my_vcr = vcr.VCR(
     cassette_library_dir=os.path.join(fixtures_dir, 'cassettes'),
     func_path_generator=cassette_filename_generator,
+    # Only replay the recorded cassettes, never reach out to a live server
+    record_mode='none',
 )
-
-
-@pytest.fixture()
-def fireflow_client():
-    return FireFlowAPIClient(
-        ALGOSEC_SERVER,
-        ALGOSEC_LOGIN_USERNAME,
-        ALGOSEC_LOGIN_PASSWORD,
-        ALGOBOT_LOGIN_USER,
-        ALGOBOT_LOGIN_PASSWORD,
-        verify_ssl=ALGOSEC_VERIFY_SSL,
-    )
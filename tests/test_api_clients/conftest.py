@@ -0,0 +1,50 @@
+import copy
+
+import pytest
+
+from algosec.api_clients.fire_flow import FireFlowAPIClient
+from algosec.api_clients.firewall_analyzer import FirewallAnalyzerAPIClient
+from tests.conftest import (
+    ALGOSEC_SERVER,
+    ALGOSEC_LOGIN_USERNAME,
+    ALGOSEC_LOGIN_PASSWORD,
+    ALGOBOT_LOGIN_USER,
+    ALGOBOT_LOGIN_PASSWORD,
+    ALGOSEC_VERIFY_SSL,
+)
+
+
+@pytest.fixture(scope="session")
+def _fireflow_client_template():
+    return FireFlowAPIClient(
+        ALGOSEC_SERVER,
+        ALGOSEC_LOGIN_USERNAME,
+        ALGOSEC_LOGIN_PASSWORD,
+        ALGOBOT_LOGIN_USER,
+        ALGOBOT_LOGIN_PASSWORD,
+        verify_ssl=ALGOSEC_VERIFY_SSL,
+    )
+
+
+@pytest.fixture()
+def fireflow_client(_fireflow_client_template):
+    """Return a copy of the session wide client"""
+    return copy.copy(_fireflow_client_template)
+
+
+@pytest.fixture(scope="session")
+def _analyzer_client_template():
+    return FirewallAnalyzerAPIClient(
+        ALGOSEC_SERVER,
+        ALGOSEC_LOGIN_USERNAME,
+        ALGOSEC_LOGIN_PASSWORD,
+        ALGOBOT_LOGIN_USER,
+        ALGOBOT_LOGIN_PASSWORD,
+        verify_ssl=ALGOSEC_VERIFY_SSL,
+    )
+
+
+@pytest.fixture()
+def analyzer_client(_analyzer_client_template):
+    """Return a copy of the session wide client"""
+    return copy.copy(_analyzer_client_template)
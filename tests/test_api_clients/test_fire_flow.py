@@ -1,12 +1,41 @@
 import pytest
+import requests
 from algosec.constants import PERMISSION_ERROR_MSG
-from mock import mock, MagicMock
+from mock import mock
+from zeep import Client
 from zeep.exceptions import Fault
 
+from algosec.api_clients.fire_flow import FireFlowAPIClient
 from algosec.errors import AlgoSecLoginError, AlgoSecAPIError, UnauthorizedUserException
 
+# Attributes of zeep's Client, used as the spec of the patched soap client
+SOAP_CLIENT_SPEC = dir(Client)
+
+# Opaque placeholder for arguments that are only passed through to the mocked soap client
+_SENTINEL = object()
+
+# Mocked content of the FireFlow users list REST response
+USERS_LIST_HEADER = (
+    '"UserName","Comments","Signature","Email","Organization","FullName","Language","ExtraInfo",'
+    '"HomePhone","WorkPhone","PagerPhone","MobilePhone","Address1","Address2","City","State","Zip",'
+    '"Country","Disabled","Authentication","isPrivileged"'
+)
+PRIVILEGED_USERS_LIST = [
+    USERS_LIST_HEADER,
+    '"username",,,"privilegd_user@email.com",,"administrator",,,,,,,,,,,,,0,"AFA",1',
+]
+
 
 class TestFireFlowAPIClient(object):
+    @pytest.fixture(autouse=True)
+    def mock_get_soap_client(self, mocker):
+        """Make sure that no test in this class ever builds a real zeep client"""
+        return mocker.patch.object(FireFlowAPIClient, '_get_soap_client')
+
+    @pytest.fixture()
+    def mock_soap_client(self, mocker):
+        return mocker.patch.object(FireFlowAPIClient, 'client', spec_set=SOAP_CLIENT_SPEC)
+
     @pytest.mark.parametrize('host,expected', [
         ('127.0.0.1', 'https://127.0.0.1/WebServices/FireFlow.wsdl'),
         ('local.algosec.com', 'https://local.algosec.com/WebServices/FireFlow.wsdl'),
@@ -15,8 +44,7 @@ class TestFireFlowAPIClient(object):
         fireflow_client.server_ip = host
         assert fireflow_client._wsdl_url_path == expected
 
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient._get_soap_client')
-    def test_initiate_client(self, mock_get_soap_client, mocker, fireflow_client):
+    def test_initiate_client(self, mock_get_soap_client, fireflow_client):
         client = fireflow_client._initiate_client()
 
         # Assert that the soap client was created properly
@@ -27,105 +55,74 @@ class TestFireFlowAPIClient(object):
         )
 
         # Assert that the soap client was logged in and the session id was saved
-        assert client.service.authenticate.call_args_list[0] == mocker.call(
+        assert client.service.authenticate.call_args_list[0] == mock.call(
             FFWSHeader={'version': '', 'opaque': ''},
             username=fireflow_client.user,
             password=fireflow_client.password,
         )
-        assert client.service.authenticate.call_args_list[1] == mocker.call(
+        assert client.service.authenticate.call_args_list[1] == mock.call(
             FFWSHeader={'version': '', 'opaque': ''},
             username=fireflow_client.algobot_login_user,
             password=fireflow_client.algobot_login_password,
         )
         assert fireflow_client._session_id == client.service.authenticate.return_value.sessionId
 
-    def test_initiate_client_login_error(self, mocker, fireflow_client):
-        mock_get_soap_client = mocker.MagicMock()
+    def test_initiate_client_login_error(self, mock_get_soap_client, fireflow_client):
         mock_get_soap_client.return_value.service.authenticate.side_effect = Fault('Login Error')
-        mocker.patch.object(fireflow_client, '_get_soap_client', mock_get_soap_client)
         with pytest.raises(AlgoSecLoginError):
             fireflow_client._initiate_client()
 
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient.client')
-    def test_get_change_request_by_id__faulty_request(self, mock_soap_client, fireflow_client):
-        """Make sure that api call failure result in AlgoSecAPIError being raised"""
-        mock_soap_client.service.getTicket.side_effect = Fault(MagicMock())
-
-        with pytest.raises(AlgoSecAPIError):
-            fireflow_client.get_change_request_by_id(MagicMock())
-
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient.client')
-    def test_create_change_request__faulty_api_call(self, mock_soap_client, fireflow_client):
+    @pytest.mark.parametrize('soap_method,api_call', [
+        ('getTicket', lambda client: client.get_change_request_by_id(_SENTINEL)),
+        ('createTicket', lambda client: client.create_change_request(
+            subject=_SENTINEL,
+            requestor_name=_SENTINEL,
+            email=_SENTINEL,
+            traffic_lines=[],
+            description=_SENTINEL,
+            template=_SENTINEL,
+        )),
+    ], ids=['get_change_request_by_id', 'create_change_request'])
+    def test_faulty_api_call(self, mock_soap_client, fireflow_client, soap_method, api_call):
         """Make sure that upon api call failure, AlgoSecAPIError is raised"""
-        mock_soap_client.service.createTicket.side_effect = Fault('Query Error')
+        getattr(mock_soap_client.service, soap_method).side_effect = Fault('API Error')
 
         with pytest.raises(AlgoSecAPIError):
-            fireflow_client.create_change_request(
-                subject=(MagicMock()),
-                requestor_name=(MagicMock()),
-                email=(MagicMock()),
-                traffic_lines=MagicMock(),
-                description=(MagicMock()),
-                template=(MagicMock()),
-            )
-
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient.client')
+            api_call(fireflow_client)
+
     def test_get_change_request_by_id__user_is_the_requestor(self, mock_soap_client, fireflow_client):
         """Test return value when requestor email equals user email."""
         mock_soap_client.service.getTicket.return_value.ticket.requestorEmail = fireflow_client.user_email
-        assert fireflow_client.get_change_request_by_id(MagicMock()) == \
+        assert fireflow_client.get_change_request_by_id(_SENTINEL) == \
             mock_soap_client.service.getTicket.return_value.ticket
 
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient.client')
-    def test_get_change_request_by_id__user_is_privileged(self, mock_soap_client, fireflow_client):
+    def test_get_change_request_by_id__user_is_privileged(self, mock_soap_client, mocker, fireflow_client):
         """Test return value when user have privileged permissions."""
         fireflow_client.algobot_login_user_defined = True
         mock_soap_client.service.getTicket.return_value.ticket.requestorEmail = "privileged_user@email.com"
-        response_patcher = mock.patch('algosec.api_clients.fire_flow.requests.get')
-        mock_response = response_patcher.start()
-        mock_response.return_value = MagicMock(name='mock_response')
-        mock_response.return_value.text.splitlines.return_value = \
-            [
-                '"UserName","Comments","Signature","Email","Organization","FullName","Language","ExtraInfo",'
-                '"HomePhone","WorkPhone","PagerPhone","MobilePhone","Address1","Address2","City","State","Zip",'
-                '"Country","Disabled","Authentication","isPrivileged"',
-                '"username",,,"privilegd_user@email.com",,"administrator",,,,,,,,,,,,,0,"AFA",1',
-            ]
-        assert fireflow_client.get_change_request_by_id(MagicMock()) == \
+        mock_requests_get = mocker.patch.object(requests, 'get')
+        mock_requests_get.return_value.text.splitlines.return_value = PRIVILEGED_USERS_LIST
+        assert fireflow_client.get_change_request_by_id(_SENTINEL) == \
             mock_soap_client.service.getTicket.return_value.ticket
 
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient.client')
-    def test_get_change_request_by_id__algobot_login_user_defined(self, mock_soap_client, fireflow_client):
+    def test_get_change_request_by_id__algobot_login_user_defined(self, mock_soap_client, mocker, fireflow_client):
         """Test usage of algobot's default user details"""
         fireflow_client.algobot_login_user_defined = True
         mock_soap_client.service.getTicket.return_value.ticket.requestorEmail = "another_user@email.com"
-        response_patcher = mock.patch('algosec.api_clients.fire_flow.requests.get')
-        mock_response = response_patcher.start()
-        mock_response.return_value = MagicMock(name='mock_response')
-        mock_response.return_value.text.splitlines.return_value = \
-            [
-                '"UserName","Comments","Signature","Email","Organization","FullName","Language","ExtraInfo",'
-                '"HomePhone","WorkPhone","PagerPhone","MobilePhone","Address1","Address2","City","State","Zip",'
-                '"Country","Disabled","Authentication","isPrivileged"',
-                '"username",,,"privilegd_user@email.com",,"administrator",,,,,,,,,,,,,0,"AFA",1',
-            ]
-        assert fireflow_client.get_change_request_by_id(MagicMock()) == \
+        mock_requests_get = mocker.patch.object(requests, 'get')
+        mock_requests_get.return_value.text.splitlines.return_value = PRIVILEGED_USERS_LIST
+        assert fireflow_client.get_change_request_by_id(_SENTINEL) == \
             mock_soap_client.service.getTicket.return_value.ticket
 
-    @mock.patch('algosec.api_clients.fire_flow.FireFlowAPIClient.client')
-    def test_get_change_request_by_id__no_permissions(self, mock_soap_client, fireflow_client):
+    def test_get_change_request_by_id__no_permissions(self, mock_soap_client, mocker, fireflow_client):
         """Make sure that api call failure result in AlgoSecAPIError being raised"""
         fireflow_client.algobot_login_user_defined = False
         mock_soap_client.service.getTicket.return_value.ticket.requestorEmail = "another_user@email.com"
-        response_patcher = mock.patch('algosec.api_clients.fire_flow.requests.get')
-        mock_response = response_patcher.start()
-        mock_response.return_value = MagicMock(name='mock_response')
-        mock_response.return_value.text.splitlines.return_value = \
-            ['"UserName","Comments","Signature","Email","Organization","FullName","Language","ExtraInfo","HomePhone",'
-             '"WorkPhone","PagerPhone","MobilePhone","Address1","Address2","City","State","Zip",'
-             '"Country","Disabled","Authentication","isPrivileged"',
+        mock_requests_get = mocker.patch.object(requests, 'get')
+        mock_requests_get.return_value.text.splitlines.return_value = \
+            [USERS_LIST_HEADER,
              '"admin",,,"admin-junk@algosec-junk.com-junk",,"administrator",,,,,,,,,,,,,0,"AFA",1',
              '"algodemoadm",,,"algodemoadm123@gmail.com",,"demo admin",,,,,,,,,,,,,0,"AFA",1',
              '"test-user",,,"testuser@algosec.com",,"TestUser",,,,,,,,,,,,,0,"AFA",1']
         with pytest.raises(UnauthorizedUserException, match=r".*{}.*".format(PERMISSION_ERROR_MSG)):
-            fireflow_client.get_change_request_by_id(MagicMock())
+            fireflow_client.get_change_request_by_id(_SENTINEL)
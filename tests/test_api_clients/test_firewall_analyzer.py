@@ -1,9 +1,13 @@
+import re
+from collections import namedtuple
+
 import mock
 import pytest
 from algosec.constants import LOGIN_FAILED_IMPERSONATION_REASON, LOGIN_FAILED_IMPERSONATION_MSG, PERMISSION_ERROR_MSG
 from mock import MagicMock
 from zeep.exceptions import Fault
 
+from algosec.api_clients import firewall_analyzer
 from algosec.api_clients.firewall_analyzer import FirewallAnalyzerAPIClient
 from algosec.errors import (
     AlgoSecLoginError,
@@ -11,26 +15,83 @@ from algosec.errors import (
     AlgoSecAPIError,
     UnauthorizedUserException)
 from algosec.models import DeviceAllowanceState
-from tests.conftest import (
-    ALGOSEC_SERVER,
-    ALGOSEC_LOGIN_USERNAME,
-    ALGOSEC_LOGIN_PASSWORD,
-    ALGOBOT_LOGIN_USER,
-    ALGOBOT_LOGIN_PASSWORD,
-    ALGOSEC_VERIFY_SSL,
+from tests.conftest import ALGOSEC_SERVER
+
+PARTIALLY_BLOCKED = DeviceAllowanceState.PARTIALLY_BLOCKED
+BLOCKED = DeviceAllowanceState.BLOCKED
+ALLOWED = DeviceAllowanceState.ALLOWED
+
+# Device lists per allowance state, only their emptiness matters to the aggregated result
+DEVICES = ["some-device"]
+NO_DEVICES = []
+
+# Endpoints the analyzer client is expected to build for ALGOSEC_SERVER
+ANALYZER_WSDL_URL = "https://{}/AFA/php/ws.php?wsdl".format(ALGOSEC_SERVER)
+ANALYZER_SOAP_LOCATION = "https://{}/AFA/php/ws.php".format(ALGOSEC_SERVER)
+
+# The messages hold regex metacharacters, so they are matched literally
+IMPERSONATION_FAILED_PATTERN = re.compile(re.escape(LOGIN_FAILED_IMPERSONATION_MSG))
+PERMISSION_ERROR_PATTERN = re.compile(re.escape(PERMISSION_ERROR_MSG))
+
+
+def _connect_call(user, password, impersonate=None):
+    """Return the expected login call of the analyzer soap service, impersonating the given email if any"""
+    if impersonate is None:
+        return mock.call(Domain="", Password=password, UserName=user)
+    return mock.call(Domain="", ImpersonateUser=impersonate, Password=password, UserName=user)
+
+
+class _Namespace(object):
+    """Plain attribute holder standing in for the objects of a zeep soap response"""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+# Simulation query input, passed through as is to the soap service
+SIMULATION_SOURCE = mock.sentinel.source
+SIMULATION_DEST = mock.sentinel.dest
+SIMULATION_SERVICE = mock.sentinel.service
+DEVICE = mock.sentinel.device
+
+SimulationMocks = namedtuple(
+    "SimulationMocks", ["source", "dest", "service", "devices", "query_url", "response", "soap_service"]
 )
 
 
+def _build_query_response(devices, query_url=None):
+    """Return a plain stand-in for the QueryResult list of a simulation query soap response"""
+    return [_Namespace(QueryItem=_Namespace(Device=devices), QueryHTMLPath=query_url)]
+
+
+def _build_simulation_mocks(devices):
+    """Return the simulation query input and a soap service mock answering it with the given devices"""
+    query_url = mock.sentinel.query_url
+    simulation_query_response = _build_query_response(devices, query_url)
+    # spec_set keeps the mocked service down to the calls the client makes on it
+    query_response = MagicMock(spec_set=["QueryResult"])
+    query_response.QueryResult = simulation_query_response
+    service_proxy = MagicMock(spec_set=["connect", "query"])
+    service_proxy.query.return_value = query_response
+    mock_soap_service = MagicMock(name="soap_service", spec_set=[], return_value=service_proxy)
+    return SimulationMocks(
+        source=SIMULATION_SOURCE,
+        dest=SIMULATION_DEST,
+        service=SIMULATION_SERVICE,
+        devices=devices,
+        query_url=query_url,
+        response=simulation_query_response,
+        soap_service=mock_soap_service,
+    )
+
+
 class TestFirewallAnalyzerAPIClient(object):
     @pytest.fixture()
-    def analyzer_client(self, request):
-        return FirewallAnalyzerAPIClient(
-            ALGOSEC_SERVER,
-            ALGOSEC_LOGIN_USERNAME,
-            ALGOSEC_LOGIN_PASSWORD,
-            ALGOBOT_LOGIN_USER,
-            ALGOBOT_LOGIN_PASSWORD,
-            verify_ssl=ALGOSEC_VERIFY_SSL,
+    def patched_helpers(self, mocker):
+        """Patch the helpers wrapped by the traffic simulation query and return (prepare, summarize) mocks"""
+        return (
+            mocker.patch.object(FirewallAnalyzerAPIClient, "_prepare_simulation_query_results"),
+            mocker.patch.object(FirewallAnalyzerAPIClient, "_get_summarized_query_result"),
         )
 
     @pytest.mark.parametrize(
@@ -51,17 +112,13 @@ class TestFirewallAnalyzerAPIClient(object):
         # Assert that the soap client was created properly
         assert client == analyzer_client._get_soap_client.return_value
         analyzer_client._get_soap_client.assert_called_once_with(
-            "https://{}/AFA/php/ws.php?wsdl".format(analyzer_client.server_ip),
-            location="https://{}/AFA/php/ws.php".format(analyzer_client.server_ip),
+            ANALYZER_WSDL_URL, location=ANALYZER_SOAP_LOCATION,
         )
 
         # Assert that the soap client was logged in and the session id was saved
         assert analyzer_client._session_id == analyzer_client._service.connect.return_value
-        assert analyzer_client._service.connect.call_args == mocker.call(
-            Domain="",
-            ImpersonateUser='created_by_algobot@algosec.com',
-            Password=analyzer_client.password,
-            UserName=analyzer_client.user,
+        assert analyzer_client._service.connect.call_args == _connect_call(
+            analyzer_client.user, analyzer_client.password, impersonate='created_by_algobot@algosec.com'
         )
 
     def test_initiate_client_login_error(self, mocker, analyzer_client):
@@ -78,126 +135,79 @@ class TestFirewallAnalyzerAPIClient(object):
         with pytest.raises(AlgoSecLoginError):
             analyzer_client._initiate_client()
 
-    def test_calc_aggregated_query_result(self):
-        assert (
-            FirewallAnalyzerAPIClient._calc_aggregated_query_result(
-                {
-                    DeviceAllowanceState.PARTIALLY_BLOCKED: ["partially-blocked"],
-                    DeviceAllowanceState.BLOCKED: ["blocked-device"],
-                    DeviceAllowanceState.ALLOWED: ["allowed-device"],
-                }
-            )
-            == DeviceAllowanceState.PARTIALLY_BLOCKED
-        )
-
-        assert (
-            FirewallAnalyzerAPIClient._calc_aggregated_query_result(
-                {
-                    DeviceAllowanceState.PARTIALLY_BLOCKED: ["some-device"],
-                    DeviceAllowanceState.BLOCKED: [],
-                    DeviceAllowanceState.ALLOWED: [],
-                }
-            )
-            == DeviceAllowanceState.PARTIALLY_BLOCKED
-        )
-
-        assert (
-            FirewallAnalyzerAPIClient._calc_aggregated_query_result(
-                {
-                    DeviceAllowanceState.PARTIALLY_BLOCKED: [],
-                    DeviceAllowanceState.BLOCKED: ["blocked-device"],
-                    DeviceAllowanceState.ALLOWED: ["allowed-device"],
-                }
-            )
-            == DeviceAllowanceState.PARTIALLY_BLOCKED
-        )
-
-        assert (
-            FirewallAnalyzerAPIClient._calc_aggregated_query_result(
-                {
-                    DeviceAllowanceState.PARTIALLY_BLOCKED: [],
-                    DeviceAllowanceState.BLOCKED: ["blocked-device"],
-                    DeviceAllowanceState.ALLOWED: [],
-                }
-            )
-            == DeviceAllowanceState.BLOCKED
-        )
-
-        assert (
-            FirewallAnalyzerAPIClient._calc_aggregated_query_result(
-                {
-                    DeviceAllowanceState.PARTIALLY_BLOCKED: [],
-                    DeviceAllowanceState.BLOCKED: [],
-                    DeviceAllowanceState.ALLOWED: ["allowed-device"],
-                }
-            )
-            == DeviceAllowanceState.ALLOWED
-        )
-
-        assert (
-            FirewallAnalyzerAPIClient._calc_aggregated_query_result(
-                {
-                    DeviceAllowanceState.PARTIALLY_BLOCKED: [],
-                    DeviceAllowanceState.BLOCKED: [],
-                    DeviceAllowanceState.ALLOWED: [],
-                }
-            )
-            == DeviceAllowanceState.ALLOWED
-        )
+    @pytest.mark.parametrize(
+        "partially_blocked,blocked,allowed,expected",
+        [
+            (DEVICES, DEVICES, DEVICES, PARTIALLY_BLOCKED),
+            (DEVICES, NO_DEVICES, NO_DEVICES, PARTIALLY_BLOCKED),
+            (NO_DEVICES, DEVICES, DEVICES, PARTIALLY_BLOCKED),
+            (NO_DEVICES, DEVICES, NO_DEVICES, BLOCKED),
+            (NO_DEVICES, NO_DEVICES, DEVICES, ALLOWED),
+            (NO_DEVICES, NO_DEVICES, NO_DEVICES, ALLOWED),
+        ],
+        ids=[
+            "all_states",
+            "only_partially_blocked",
+            "blocked_and_allowed",
+            "only_blocked",
+            "only_allowed",
+            "no_devices",
+        ],
+    )
+    def test_calc_aggregated_query_result(self, partially_blocked, blocked, allowed, expected):
+        query_results = {PARTIALLY_BLOCKED: partially_blocked, BLOCKED: blocked, ALLOWED: allowed}
+        assert FirewallAnalyzerAPIClient._calc_aggregated_query_result(query_results) == expected
 
-    def test_prepare_simulation_query_results(self, mocker):
+    def test_prepare_simulation_query_results(self):
         device_1 = MagicMock()
         device_2 = MagicMock()
         device_3 = MagicMock()
 
-        def mock_device_to_allowance_state(device):
-            return {
-                device_1.IsAllowed: DeviceAllowanceState.PARTIALLY_BLOCKED,
-                device_2.IsAllowed: DeviceAllowanceState.BLOCKED,
-                device_3.IsAllowed: DeviceAllowanceState.ALLOWED,
-            }[device]
+        allowance_state_per_device = {
+            device_1.IsAllowed: PARTIALLY_BLOCKED,
+            device_2.IsAllowed: BLOCKED,
+            device_3.IsAllowed: ALLOWED,
+        }
 
         # Mock the from_string method return values per device
-        mocker.patch.object(
+        with mock.patch.object(
             DeviceAllowanceState,
             "from_string",
-            side_effect=mock_device_to_allowance_state,
-        )
-        query_results = FirewallAnalyzerAPIClient._prepare_simulation_query_results(
-            [device_1, device_2, device_3]
-        )
+            side_effect=allowance_state_per_device.__getitem__,
+        ):
+            query_results = FirewallAnalyzerAPIClient._prepare_simulation_query_results(
+                [device_1, device_2, device_3]
+            )
 
-        assert query_results[DeviceAllowanceState.PARTIALLY_BLOCKED] == [device_1]
-        assert query_results[DeviceAllowanceState.BLOCKED] == [device_2]
-        assert query_results[DeviceAllowanceState.ALLOWED] == [device_3]
+        assert query_results[PARTIALLY_BLOCKED] == [device_1]
+        assert query_results[BLOCKED] == [device_2]
+        assert query_results[ALLOWED] == [device_3]
 
     def test_prepare_simulation_query_results__ordered_result_keys(self):
         """Assert that the result keys are sorted for later preview requirements"""
         query_results = FirewallAnalyzerAPIClient._prepare_simulation_query_results([])
         assert list(query_results.keys()) == [
-            DeviceAllowanceState.BLOCKED,
-            DeviceAllowanceState.PARTIALLY_BLOCKED,
-            DeviceAllowanceState.ALLOWED,
+            BLOCKED,
+            PARTIALLY_BLOCKED,
+            ALLOWED,
         ]
 
-    @mock.patch("algosec.api_clients.firewall_analyzer.logger")
-    def test_prepare_simulation_query_results__unknown_allowance_state(
-        self, mock_module_logger, mocker
-    ):
+    def test_prepare_simulation_query_results__unknown_allowance_state(self, mocker):
         """Make sure that a warning is logged when the allowance state is unrecognized"""
+        mock_module_logger = mocker.patch.object(firewall_analyzer, "logger")
         device_1 = MagicMock()
-        mocker.patch.object(
-            DeviceAllowanceState, "from_string", side_effect=UnrecognizedAllowanceState
-        )
         assert mock_module_logger.warning.call_count == 0
-        FirewallAnalyzerAPIClient._prepare_simulation_query_results([device_1])
+        with mock.patch.object(
+            DeviceAllowanceState, "from_string", side_effect=UnrecognizedAllowanceState
+        ):
+            FirewallAnalyzerAPIClient._prepare_simulation_query_results([device_1])
         assert mock_module_logger.warning.call_count == 1
 
     def test_get_summarized_query_result__api_result_missing(
         self, analyzer_client, mocker
     ):
         # Mock missing attribute "QueryResult" from the query response
-        query_response = MagicMock(spec=[])
+        query_response = _Namespace()
         query_results = MagicMock()
         mocker.patch.object(
             FirewallAnalyzerAPIClient, "_calc_aggregated_query_result"
@@ -214,355 +224,183 @@ class TestFirewallAnalyzerAPIClient(object):
             == analyzer_client._calc_aggregated_query_result.return_value
         )
 
-    @mock.patch("algosec.models.DeviceAllowanceState.from_string")
-    def test__get_summarized_query_result__api_result_present(
-        self, mock_from_string, analyzer_client
-    ):
-        query_response = MagicMock(spec=["QueryResult"])
+    def test__get_summarized_query_result__api_result_present(self, analyzer_client):
+        query_response = _Namespace(QueryResult=mock.sentinel.query_result)
         query_results = MagicMock()
 
-        aggregated_result = analyzer_client._get_summarized_query_result(
-            query_response, query_results
-        )
+        with mock.patch.object(DeviceAllowanceState, "from_string") as mock_from_string:
+            aggregated_result = analyzer_client._get_summarized_query_result(
+                query_response, query_results
+            )
 
         mock_from_string.assert_called_once_with(query_response.QueryResult)
         assert aggregated_result == mock_from_string.return_value
 
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._prepare_simulation_query_results"
-    )
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._get_summarized_query_result"
-    )
-    def test_execute_traffic_simulation_query(
-        self, mock_get_summarized_query, mock_prepare_results, mocker, analyzer_client
-    ):
-        # Mock the client and it's response content
-        query_response_devices = [MagicMock()]
-        simulation_query_response = MagicMock()
-        simulation_query_response[0].QueryItem.Device = query_response_devices
-        mock_soap_client = MagicMock()
-        mock_soap_client.service.query.return_value.QueryResult = (
-            simulation_query_response
-        )
-        analyzer_client._session_id = MagicMock()
-
-        # mock the simulation input
-        source = MagicMock()
-        dest = MagicMock()
-        service = MagicMock()
-        mocker.patch.object(analyzer_client, "_client", mock_soap_client)
-        simulation_result = analyzer_client.execute_traffic_simulation_query(
-            source, dest, service
-        )
-
-        # assert return value
-        assert simulation_result == mock_get_summarized_query.return_value
-
-        # assert internal simulation query call
-        mock_soap_client.service.query.assert_called_once_with(
-            SessionID=analyzer_client._session_id,
-            QueryInput={"Source": source, "Destination": dest, "Service": service},
-        )
-
-        # assert internal helper calls
-        mock_prepare_results.assert_called_once_with(query_response_devices)
-        mock_get_summarized_query.assert_called_once_with(
-            simulation_query_response[0], mock_prepare_results.return_value
-        )
-
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._prepare_simulation_query_results"
-    )
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._get_summarized_query_result"
-    )
-    def test_execute_traffic_simulation_query__one_device_in_result(
-        self, mock_get_summarized_query, mock_prepare_results, mocker, analyzer_client
-    ):
-        """Make sure that one device in the query is interpreted as a list"""
-        # Mock the client and it's response content
-        query_response_devices = MagicMock()
-        simulation_query_response = MagicMock()
-        simulation_query_response[0].QueryItem.Device = query_response_devices
-        mock_soap_service = MagicMock()
-        mock_soap_service.query.return_value.QueryResult = (
-            simulation_query_response
-        )
-
-        mocker.patch.object(analyzer_client, "_service", mock_soap_service)
-        mocker.patch.object(analyzer_client, "_client", MagicMock())
-        analyzer_client.execute_traffic_simulation_query(
-            MagicMock(), MagicMock(), MagicMock()
-        )
-
-        # assert that the single device was converted to list
-        mock_prepare_results.assert_called_once_with([query_response_devices])
-
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._prepare_simulation_query_results"
-    )
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._get_summarized_query_result"
+    @pytest.mark.parametrize(
+        "devices,expected_devices",
+        [
+            ([DEVICE], [DEVICE]),
+            (DEVICE, [DEVICE]),
+            (None, []),
+        ],
+        ids=["device_list", "one_device_in_result", "empty_query_result"],
     )
-    def test_execute_traffic_simulation_query__empty_query_result(
-        self, mock_get_summarized_query, mock_prepare_results, mocker, analyzer_client
+    def test_execute_traffic_simulation_query__result_devices(
+        self, patched_helpers, analyzer_client, devices, expected_devices
     ):
-        """Make sure that function can handle no devices in result"""
-        # Mock the client and it's response content
-        simulation_query_response = MagicMock()
-        simulation_query_response[0].QueryItem = None
-        mock_soap_service = MagicMock()
-        mock_soap_service.query.return_value.QueryResult = (
-            simulation_query_response
-        )
-
-        mocker.patch.object(analyzer_client, "_service", mock_soap_service)
-        mocker.patch.object(analyzer_client, "_client", MagicMock())
-        analyzer_client.execute_traffic_simulation_query(
-            MagicMock(), MagicMock(), MagicMock()
-        )
+        """Make sure that the result devices are always handed over as a list
+
+        A single device is listified and a result without a query item means no devices.
+        """
+        mock_prepare_results, _ = patched_helpers
+        mocks = _build_simulation_mocks(devices)
+        if devices is None:
+            mocks.response[0].QueryItem = None
+        with mock.patch.object(analyzer_client, "_soap_service", mocks.soap_service), \
+                mock.patch.object(analyzer_client, "_client", MagicMock()):
+            analyzer_client.execute_traffic_simulation_query(
+                mocks.source, mocks.dest, mocks.service
+            )
 
-        # assert that the device list was assumed to be empty
-        mock_prepare_results.assert_called_once_with([])
+        mock_prepare_results.assert_called_once_with(expected_devices)
 
-    def test_execute_traffic_simulation_query__faulty_query(self, mocker, analyzer_client):
+    def test_execute_traffic_simulation_query__faulty_query(self, analyzer_client):
         mock_soap_service = MagicMock()
         mock_soap_service.return_value.query.side_effect = Fault(
             "Query Error"
         )
 
-        mocker.patch.object(analyzer_client, "_soap_service", mock_soap_service)
-        mocker.patch.object(
-            analyzer_client, "_get_soap_client", MagicMock()
-        )
-        with pytest.raises(AlgoSecAPIError):
+        with mock.patch.object(analyzer_client, "_soap_service", mock_soap_service), \
+                mock.patch.object(analyzer_client, "_get_soap_client", MagicMock()), \
+                pytest.raises(AlgoSecAPIError):
             analyzer_client.execute_traffic_simulation_query(
-                MagicMock(), MagicMock(), MagicMock()
+                SIMULATION_SOURCE, SIMULATION_DEST, SIMULATION_SERVICE
             )
 
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._prepare_simulation_query_results"
-    )
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._get_summarized_query_result"
+    @pytest.mark.parametrize(
+        "extra_kwargs,expected_query_target,expected_query_input_extra",
+        [
+            ({}, {}, {}),
+            ({"target": "someFirewallDevice"}, {"QueryTarget": "someFirewallDevice"}, {}),
+            ({"application": "ping"}, {}, {"Application": "ping"}),
+        ],
+        ids=["plain", "with_target", "with_application"],
     )
     def test_execute_traffic_simulation_query(
-        self, mock_get_summarized_query, mock_prepare_results, mocker, analyzer_client
+        self,
+        patched_helpers,
+        analyzer_client,
+        extra_kwargs,
+        expected_query_target,
+        expected_query_input_extra,
     ):
-        # Mock the client and it's response content
-        query_response_devices = [MagicMock()]
-        query_response_url = [MagicMock()]
-        simulation_query_response = MagicMock()
-        simulation_query_response[0].QueryItem.Device = query_response_devices
-        simulation_query_response[0].QueryHTMLPath = query_response_url
-        mock_soap_service = MagicMock()
-        mock_soap_service.return_value.query.return_value.QueryResult = (
-            simulation_query_response
-        )
-        mocker.patch.object(analyzer_client, "_soap_service", mock_soap_service)
-        mocker.patch.object(
-            analyzer_client, "_client", MagicMock()
-        )
+        mock_prepare_results, mock_get_summarized_query = patched_helpers
+        mocks = _build_simulation_mocks([MagicMock()])
         analyzer_client._session_id = MagicMock()
 
-        # mock the simulation input
-        source = MagicMock()
-        dest = MagicMock()
-        service = MagicMock()
-        simulation_result = analyzer_client.execute_traffic_simulation_query(
-            source, dest, service
-        )
+        with mock.patch.object(analyzer_client, "_soap_service", mocks.soap_service), \
+                mock.patch.object(analyzer_client, "_client", MagicMock()):
+            simulation_result = analyzer_client.execute_traffic_simulation_query(
+                mocks.source, mocks.dest, mocks.service, **extra_kwargs
+            )
 
         # assert return value
         assert simulation_result == {
             "result": mock_get_summarized_query.return_value,
-            "query_url": query_response_url,
-            "raw_response": simulation_query_response,
+            "query_url": mocks.query_url,
+            "raw_response": mocks.response,
         }
 
         # assert internal simulation query call
-        mock_soap_service.return_value.query.assert_called_once_with(
+        expected_query_input = {"Source": mocks.source, "Destination": mocks.dest, "Service": mocks.service}
+        expected_query_input.update(expected_query_input_extra)
+        mocks.soap_service.return_value.query.assert_called_once_with(
             SessionID=analyzer_client._session_id,
-            QueryInput={"Source": source, "Destination": dest, "Service": service},
+            QueryInput=expected_query_input,
+            **expected_query_target
         )
 
         # assert internal helper calls
-        mock_prepare_results.assert_called_once_with(query_response_devices)
+        mock_prepare_results.assert_called_once_with(mocks.devices)
         mock_get_summarized_query.assert_called_once_with(
-            simulation_query_response[0], mock_prepare_results.return_value
+            mocks.response[0], mock_prepare_results.return_value
         )
 
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._prepare_simulation_query_results"
-    )
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._get_summarized_query_result"
-    )
-    def test_execute_traffic_simulation_query__with_target(
-        self, mock_get_summarized_query, mock_prepare_results, mocker, analyzer_client
+    def test_run_traffic_simulation_query__legacy_return_shape(
+        self, patched_helpers, analyzer_client
     ):
-        # Mock the client and it's response content
-        query_response_devices = [MagicMock()]
-        query_response_url = [MagicMock()]
-        simulation_query_response = MagicMock()
-        simulation_query_response[0].QueryItem.Device = query_response_devices
-        simulation_query_response[0].QueryHTMLPath = query_response_url
-        mock_soap_service = MagicMock()
-        mock_soap_service.return_value.query.return_value.QueryResult = (
-            simulation_query_response
-        )
-        mocker.patch.object(analyzer_client, "_soap_service", mock_soap_service)
-        mocker.patch.object(
-            analyzer_client, "_client", MagicMock()
-        )
+        """The deprecated query call returns the summarized result alone"""
+        mock_prepare_results, mock_get_summarized_query = patched_helpers
+        mocks = _build_simulation_mocks([MagicMock()])
         analyzer_client._session_id = MagicMock()
 
-        # mock the simulation input
-        source = MagicMock()
-        dest = MagicMock()
-        service = MagicMock()
-        target_firewall = "someFirewallDevice"
-        simulation_result = analyzer_client.execute_traffic_simulation_query(
-            source, dest, service, target=target_firewall
-        )
-
-        # assert return value
-        assert simulation_result == {
-            "result": mock_get_summarized_query.return_value,
-            "query_url": query_response_url,
-            "raw_response": simulation_query_response,
-        }
+        with mock.patch.object(analyzer_client, "_soap_service", mocks.soap_service), \
+                mock.patch.object(analyzer_client, "_client", MagicMock()), \
+                pytest.deprecated_call():
+            simulation_result = analyzer_client.run_traffic_simulation_query(
+                mocks.source, mocks.dest, mocks.service
+            )
 
-        # assert internal simulation query call
-        mock_soap_service.return_value.query.assert_called_once_with(
+        assert simulation_result == mock_get_summarized_query.return_value
+        mocks.soap_service.return_value.query.assert_called_once_with(
             SessionID=analyzer_client._session_id,
-            QueryInput={"Source": source, "Destination": dest, "Service": service},
-            QueryTarget=target_firewall,
+            QueryInput={"Source": mocks.source, "Destination": mocks.dest, "Service": mocks.service},
         )
-
-        # assert internal helper calls
-        mock_prepare_results.assert_called_once_with(query_response_devices)
+        mock_prepare_results.assert_called_once_with(mocks.devices)
         mock_get_summarized_query.assert_called_once_with(
-            simulation_query_response[0], mock_prepare_results.return_value
+            mocks.response[0], mock_prepare_results.return_value
         )
 
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._prepare_simulation_query_results"
-    )
-    @mock.patch(
-        "algosec.api_clients.firewall_analyzer.FirewallAnalyzerAPIClient._get_summarized_query_result"
+    @pytest.mark.parametrize(
+        "connect_side_effect,expected_outcome",
+        [
+            (None, "impersonated"),
+            ([Fault(LOGIN_FAILED_IMPERSONATION_REASON), mock.DEFAULT], "algobot_user"),
+            (
+                [
+                    Fault(LOGIN_FAILED_IMPERSONATION_REASON),
+                    Fault(LOGIN_FAILED_IMPERSONATION_REASON),
+                    Fault(LOGIN_FAILED_IMPERSONATION_REASON),
+                    mock.DEFAULT,
+                ],
+                "unauthorized",
+            ),
+        ],
+        ids=["succeeded", "default_algobot_user", "failed"],
     )
-    def test_execute_traffic_simulation_query__with_application(
-        self, mock_get_summarized_query, mock_prepare_results, mocker, analyzer_client
+    def test_initiate_client_login_impersonation(
+        self, mocker, analyzer_client, connect_side_effect, expected_outcome
     ):
-        # Mock the client and it's response content
-        query_response_devices = [MagicMock()]
-        query_response_url = [MagicMock()]
-        simulation_query_response = MagicMock()
-        simulation_query_response[0].QueryItem.Device = query_response_devices
-        simulation_query_response[0].QueryHTMLPath = query_response_url
-        mock_soap_service = MagicMock()
-        mock_soap_service.return_value.query.return_value.QueryResult = (
-            simulation_query_response
-        )
-        mocker.patch.object(analyzer_client, "_soap_service", mock_soap_service)
-        mocker.patch.object(
-            analyzer_client, "_client", MagicMock()
-        )
-        analyzer_client._session_id = MagicMock()
-
-        # mock the simulation input
-        source = MagicMock()
-        dest = MagicMock()
-        service = MagicMock()
-        network_application = "ping"
-        simulation_result = analyzer_client.execute_traffic_simulation_query(
-            source, dest, service, application=network_application
-        )
-
-        # assert return value
-        assert simulation_result == {
-            "result": mock_get_summarized_query.return_value,
-            "query_url": query_response_url,
-            "raw_response": simulation_query_response,
-        }
-
-        # assert internal simulation query call
-        mock_soap_service.return_value.query.assert_called_once_with(
-            SessionID=analyzer_client._session_id,
-            QueryInput={
-                "Source": source,
-                "Destination": dest,
-                "Service": service,
-                "Application": network_application,
-            },
-        )
-
-        # assert internal helper calls
-        mock_prepare_results.assert_called_once_with(query_response_devices)
-        mock_get_summarized_query.assert_called_once_with(
-            simulation_query_response[0], mock_prepare_results.return_value
-        )
-
-    def test_initiate_client_login_impersonation_succeeded(self, mocker, analyzer_client):
-        mocker.patch.object(
-            analyzer_client, "_get_soap_client", MagicMock(name="soap_client")
-        )
-        analyzer_client._initiate_client()
-        assert analyzer_client._service.connect.call_args_list[0] == mocker.call(
-            Domain="",
-            ImpersonateUser='created_by_algobot@algosec.com',
-            Password=analyzer_client.password,
-            UserName=analyzer_client.user,
-        )
-        assert len(analyzer_client._service.connect.call_args_list) == 1
-
-    def test_initiate_client_login_impersonation_default_algobot_user(self, mocker, analyzer_client):
         mock_soap_service = MagicMock(name="soap_service")
-        mock_soap_service.return_value.connect.side_effect = [Fault(
-            LOGIN_FAILED_IMPERSONATION_REASON
-        ), mock.DEFAULT]
+        mock_soap_service.return_value.connect.side_effect = connect_side_effect
 
         mocker.patch.object(analyzer_client, "_soap_service", mock_soap_service)
         mocker.patch.object(
             analyzer_client, "_get_soap_client", MagicMock(name="soap_client")
         )
-        analyzer_client._initiate_client()
-        assert mock_soap_service.return_value.connect.call_args_list[0] == mocker.call(
-            Domain="",
-            ImpersonateUser='created_by_algobot@algosec.com',
-            Password=analyzer_client.password,
-            UserName=analyzer_client.user,
+        mock_connect = mock_soap_service.return_value.connect
+        impersonation_call = _connect_call(
+            analyzer_client.user, analyzer_client.password, impersonate='created_by_algobot@algosec.com'
         )
-        assert mock_soap_service.return_value.connect.call_args_list[1] == mocker.call(
-            Domain="",
-            Password=analyzer_client.algobot_login_password,
-            UserName=analyzer_client.algobot_login_user,
-        )
-        # Assert that the soap client was logged in and the session id was saved
-        assert analyzer_client._session_id == mock_soap_service.return_value.connect.return_value
 
-    def test_initiate_client_login_impersonation_failed(self, mocker, analyzer_client):
+        if expected_outcome == "unauthorized":
+            with pytest.raises(UnauthorizedUserException, match=IMPERSONATION_FAILED_PATTERN):
+                analyzer_client._initiate_client()
+            with pytest.raises(UnauthorizedUserException, match=IMPERSONATION_FAILED_PATTERN):
+                analyzer_client.algobot_login_user = None
+                analyzer_client._initiate_client()
+            return
 
-        mock_soap_service = MagicMock(name="soap_service")
-        mock_soap_service.return_value.connect.side_effect = \
-            [
-                Fault(LOGIN_FAILED_IMPERSONATION_REASON),
-                Fault(LOGIN_FAILED_IMPERSONATION_REASON),
-                Fault(LOGIN_FAILED_IMPERSONATION_REASON),
-                mock.DEFAULT
+        analyzer_client._initiate_client()
+        if expected_outcome == "impersonated":
+            assert mock_connect.call_args_list == [impersonation_call]
+        else:
+            assert mock_connect.call_args_list == [
+                impersonation_call,
+                _connect_call(analyzer_client.algobot_login_user, analyzer_client.algobot_login_password),
             ]
-
-        mocker.patch.object(analyzer_client, "_soap_service", mock_soap_service)
-        mocker.patch.object(
-            analyzer_client, "_get_soap_client", MagicMock(name="soap_client")
-        )
-        with pytest.raises(UnauthorizedUserException, match=r".*{}.*".format(LOGIN_FAILED_IMPERSONATION_MSG)):
-            analyzer_client._initiate_client()
-        with pytest.raises(UnauthorizedUserException, match=r".*{}.*".format(LOGIN_FAILED_IMPERSONATION_MSG)):
-            analyzer_client.algobot_login_user = None
-            analyzer_client._initiate_client()
+        # Assert that the soap client was logged in and the session id was saved
+        assert analyzer_client._session_id == mock_connect.return_value
 
     def test_afa_session_id_getter_impersonation_failed(self,mocker,analyzer_client):
         mock_soap_service = MagicMock(name="soap_service")
@@ -596,9 +434,7 @@ class TestFirewallAnalyzerAPIClient(object):
 
         analyzer_client._session_id = MagicMock()
 
-        # mock the simulation input
-        source = MagicMock()
-        dest = MagicMock()
-        service = MagicMock()
-        with pytest.raises(UnauthorizedUserException, match=r".*{}.*".format(PERMISSION_ERROR_MSG)):
-            analyzer_client._execute_traffic_simulation_query(source, dest, service)
+        with pytest.raises(UnauthorizedUserException, match=PERMISSION_ERROR_PATTERN):
+            analyzer_client._execute_traffic_simulation_query(
+                SIMULATION_SOURCE, SIMULATION_DEST, SIMULATION_SERVICE
+            )
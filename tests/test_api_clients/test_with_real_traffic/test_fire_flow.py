@@ -1,31 +1,59 @@
+from operator import attrgetter
+
 from algosec.models import ChangeRequestTrafficLine, ChangeRequestAction
 from tests.conftest import my_vcr
 
+# Address and service lists of the traffic lines below
+INTERNAL_HOSTS = ['10.0.0.1', '10.0.0.2']
+EXTERNAL_HOSTS = ['192.168.1.3', '192.168.1.4']
+BLOCKED_SOURCES = ['192.168.1.1', '192.168.1.2']
+BLOCKED_DESTINATIONS = ['10.0.0.3', '10.0.0.4']
+WEB_SERVICES = ['tcp/80', 'tcp/443']
+
+HTTP_TRAFFIC_LINE = ChangeRequestTrafficLine(
+    ChangeRequestAction.ALLOW,
+    INTERNAL_HOSTS,
+    EXTERNAL_HOSTS,
+    ['http', 'https'],
+)
+SSH_TRAFFIC_LINE = ChangeRequestTrafficLine(
+    ChangeRequestAction.BLOCK,
+    BLOCKED_SOURCES,
+    BLOCKED_DESTINATIONS,
+    ['ssh', 'tcp/50'],
+)
+TCP_ALLOW_TRAFFIC_LINE = ChangeRequestTrafficLine(
+    ChangeRequestAction.ALLOW,
+    INTERNAL_HOSTS,
+    EXTERNAL_HOSTS,
+    WEB_SERVICES,
+)
+TCP_BLOCK_TRAFFIC_LINE = ChangeRequestTrafficLine(
+    ChangeRequestAction.BLOCK,
+    BLOCKED_SOURCES,
+    BLOCKED_DESTINATIONS,
+    ['tcp/23', 'tcp/50'],
+)
+APPLICATIONS_TRAFFIC_LINE = ChangeRequestTrafficLine(
+    ChangeRequestAction.ALLOW,
+    INTERNAL_HOSTS,
+    EXTERNAL_HOSTS,
+    WEB_SERVICES,
+    ['ping', 'facebook-chat'],
+)
+
 
 class TestFireFlowAPIClient(object):
     @my_vcr.use_cassette()
     def test_create_change_request__assert_returned_url(self, fireflow_client):
         """Test change request creation with real API communication."""
-        traffic_line1 = ChangeRequestTrafficLine(
-            ChangeRequestAction.ALLOW,
-            ['10.0.0.1', '10.0.0.2'],
-            ['192.168.1.3', '192.168.1.4'],
-            ['http', 'https'],
-        )
-        traffic_line2 = ChangeRequestTrafficLine(
-            ChangeRequestAction.DROP,
-            ['192.168.1.1', '192.168.1.2'],
-            ['10.0.0.3', '10.0.0.4'],
-            ['ssh', 'tcp/50'],
-        )
-
         ticket_url = fireflow_client.create_change_request(
             subject='Some ticket traffic',
             requestor_name='Tester First Name',
             email='email@testing.com',
             traffic_lines=[
-                traffic_line1,
-                traffic_line2
+                HTTP_TRAFFIC_LINE,
+                SSH_TRAFFIC_LINE
             ],
             description='Ticket created by the AlgoSec Python SDK Unit testing module',
             template=None,
@@ -48,19 +76,6 @@ class TestFireFlowAPIClient(object):
     @my_vcr.use_cassette()
     def test_create_change_request__and_then_fetch_it_and_compare(self, fireflow_client):
         """Test change request creation with real API communication."""
-        traffic_line1 = ChangeRequestTrafficLine(
-            ChangeRequestAction.ALLOW,
-            ['10.0.0.1', '10.0.0.2'],
-            ['192.168.1.3', '192.168.1.4'],
-            ['tcp/80', 'tcp/443'],
-        )
-        traffic_line2 = ChangeRequestTrafficLine(
-            ChangeRequestAction.DROP,
-            ['192.168.1.1', '192.168.1.2'],
-            ['10.0.0.3', '10.0.0.4'],
-            ['tcp/23', 'tcp/50'],
-        )
-
         ticket_subject = 'Some traffic change request subject'
         requestor_name = 'Tester First Name'
         requestor_email = 'email@testing.com'
@@ -70,8 +85,8 @@ class TestFireFlowAPIClient(object):
             requestor_name=requestor_name,
             email=requestor_email,
             traffic_lines=[
-                traffic_line1,
-                traffic_line2
+                TCP_ALLOW_TRAFFIC_LINE,
+                TCP_BLOCK_TRAFFIC_LINE
             ],
             description=ticket_description,
             template=None,
@@ -89,12 +104,13 @@ class TestFireFlowAPIClient(object):
 
         # Assert each of the traffic lines and it's content
         assert len(ticket.trafficLines) == 2
-        for line_index, local_traffic_line in enumerate([traffic_line1, traffic_line2]):
-            traffic_line_in_ticket = ticket.trafficLines[line_index]
-            sources_in_ticket = [i.address for i in traffic_line_in_ticket.trafficSource]
-            dests_in_ticket = [i.address for i in traffic_line_in_ticket.trafficDestination]
-            services_in_ticket = [i.service for i in traffic_line_in_ticket.trafficService]
-            applications_in_ticket = [i.application for i in traffic_line_in_ticket.trafficApplication]
+        for traffic_line_in_ticket, local_traffic_line in zip(
+                ticket.trafficLines, (TCP_ALLOW_TRAFFIC_LINE, TCP_BLOCK_TRAFFIC_LINE)
+        ):
+            sources_in_ticket = list(map(attrgetter('address'), traffic_line_in_ticket.trafficSource))
+            dests_in_ticket = list(map(attrgetter('address'), traffic_line_in_ticket.trafficDestination))
+            services_in_ticket = list(map(attrgetter('service'), traffic_line_in_ticket.trafficService))
+            applications_in_ticket = list(map(attrgetter('application'), traffic_line_in_ticket.trafficApplication))
             action_in_ticket = traffic_line_in_ticket.action
 
             assert local_traffic_line.action.value.api_value == action_in_ticket
@@ -106,14 +122,6 @@ class TestFireFlowAPIClient(object):
     @my_vcr.use_cassette()
     def test_create_change_request___with_applications_and_then_fetch_it_and_compare(self, fireflow_client):
         """Test change request creation with real API communication."""
-        local_traffic_line = ChangeRequestTrafficLine(
-            ChangeRequestAction.ALLOW,
-            ['10.0.0.1', '10.0.0.2'],
-            ['192.168.1.3', '192.168.1.4'],
-            ['tcp/80', 'tcp/443'],
-            ['ping', 'facebook-chat'],
-        )
-
         ticket_subject = 'Some traffic change request subject'
         requestor_name = 'Tester First Name'
         requestor_email = 'email@testing.com'
@@ -122,7 +130,7 @@ class TestFireFlowAPIClient(object):
             subject=ticket_subject,
             requestor_name=requestor_name,
             email=requestor_email,
-            traffic_lines=[local_traffic_line],
+            traffic_lines=[APPLICATIONS_TRAFFIC_LINE],
             description=ticket_description,
             template=None,
         )
@@ -133,14 +141,14 @@ class TestFireFlowAPIClient(object):
         # Assert each of the traffic lines and it's content
         assert len(ticket.trafficLines) == 1
         traffic_line_in_ticket = ticket.trafficLines[0]
-        sources_in_ticket = [i.address for i in traffic_line_in_ticket.trafficSource]
-        dests_in_ticket = [i.address for i in traffic_line_in_ticket.trafficDestination]
-        services_in_ticket = [i.service for i in traffic_line_in_ticket.trafficService]
-        applications_in_ticket = [i.application for i in traffic_line_in_ticket.trafficApplication]
+        sources_in_ticket = list(map(attrgetter('address'), traffic_line_in_ticket.trafficSource))
+        dests_in_ticket = list(map(attrgetter('address'), traffic_line_in_ticket.trafficDestination))
+        services_in_ticket = list(map(attrgetter('service'), traffic_line_in_ticket.trafficService))
+        applications_in_ticket = list(map(attrgetter('application'), traffic_line_in_ticket.trafficApplication))
         action_in_ticket = traffic_line_in_ticket.action
 
-        assert action_in_ticket == local_traffic_line.action.value.api_value
-        assert sources_in_ticket == local_traffic_line.sources
-        assert dests_in_ticket == local_traffic_line.destinations
-        assert services_in_ticket == local_traffic_line.services
-        assert applications_in_ticket == local_traffic_line.applications
+        assert action_in_ticket == APPLICATIONS_TRAFFIC_LINE.action.value.api_value
+        assert sources_in_ticket == APPLICATIONS_TRAFFIC_LINE.sources
+        assert dests_in_ticket == APPLICATIONS_TRAFFIC_LINE.destinations
+        assert services_in_ticket == APPLICATIONS_TRAFFIC_LINE.services
+        assert applications_in_ticket == APPLICATIONS_TRAFFIC_LINE.applications
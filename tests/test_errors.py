@@ -1,25 +1,30 @@
+import mock
+import pytest
+
 from algosec.errors import AlgoSecAPIError, UnauthorizedUserException
 
+RESPONSE = mock.sentinel.response
 
-class TestAlgoSecAPIError(object):
-    def test_with_response_object(self, mocker):
-        status_code, response_content, response = 12345, "some-response-content", mocker.MagicMock()
-        error = AlgoSecAPIError(
+DEFAULT_API_ERROR = AlgoSecAPIError()
+DEFAULT_UNAUTHORIZED_ERROR = UnauthorizedUserException()
 
-            status_code=status_code,
-            response_content=response_content,
-            response=response,
-        )
 
-        assert error.status_code == status_code
-        assert error.response_content == response_content
-        assert error.response == response
+class TestAlgoSecAPIError(object):
+    @pytest.mark.parametrize("kwargs,expected_attributes", [
+        (
+            dict(status_code=12345, response_content="some-response-content", response=RESPONSE),
+            dict(status_code=12345, response_content="some-response-content", response=RESPONSE),
+        ),
+    ], ids=["with_response_object"])
+    def test_response_attributes(self, kwargs, expected_attributes):
+        error = AlgoSecAPIError(**kwargs)
+        for attribute, expected in expected_attributes.items():
+            assert getattr(error, attribute) == expected
 
     def test_with_no_response_object(self):
-        error = AlgoSecAPIError()
-        assert error.status_code is None
-        assert error.response_content is None
-        assert error.response is None
+        assert DEFAULT_API_ERROR.status_code is None
+        assert DEFAULT_API_ERROR.response_content is None
+        assert DEFAULT_API_ERROR.response is None
 
 class TestUnauthorizedUserException(object):
     def test_with_msg_and_details(self):
@@ -30,6 +35,5 @@ class TestUnauthorizedUserException(object):
 
 
     def test_without_msg_and_details(self):
-        error = UnauthorizedUserException()
-        assert error.message == ""
-        assert error.extra_details == ""
+        assert DEFAULT_UNAUTHORIZED_ERROR.message == ""
+        assert DEFAULT_UNAUTHORIZED_ERROR.extra_details == ""
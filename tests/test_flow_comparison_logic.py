@@ -1,7 +1,7 @@
-from hamcrest.core import assert_that
-from hamcrest.core.core import is_
-from hamcrest.core.core.isequal import equal_to
-from mock import Mock, patch
+from collections import namedtuple
+
+import pytest
+from mock import DEFAULT, patch, sentinel
 
 from algosec.flow_comparison_logic import (
     ANY_OBJECT,
@@ -10,192 +10,107 @@ from algosec.flow_comparison_logic import (
 )
 
 
-class TestIsEqualToFlowComparisonLogic(object):
-
-    def test__are_sources_equal_in_flow(self):
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_sources_equal_in_flow(
-                ["objectName1", "objectName2"],
-                [{"name": "objectName1"}, {"name": "objectName2"}],
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_sources_equal_in_flow(
-                ["objectName1"],
-                [{"name": "UnknownObjectName"}],
-            ),
-            is_(equal_to(False))
-        )
-
-    def test__are_destinations_equal_in_flow(self):
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_destinations_equal_in_flow(
-                ["objectName1", "objectName2"],
-                [{"name": "objectName1"}, {"name": "objectName2"}],
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_destinations_equal_in_flow(
-                ["objectName1"],
-                [{"name": "UnknownObjectName"}],
-            ),
-            is_(equal_to(False))
-        )
-
-    def test__are_network_applications_equal_in_flow(self):
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(
-                ["app1", "app2"],
-                [{"name": "app1"}, {"name": "app2"}]
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(
-                ["app1", "app2", "app3"],
-                [{"name": "app1"}, {"name": "app2"}]
-            ),
-            is_(equal_to(False))
-        )
-
-        # Test the case where the network applications are set to ANY on the server
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(
-                [],
-                [ANY_NETWORK_APPLICATION]
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(
-                ["app1"],
-                [ANY_NETWORK_APPLICATION]
-            ),
-            is_(equal_to(False))
-        )
-
-        # Test the case where the network applications are missing from the server
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(
-                [],
-                []
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(
-                ["app1"],
-                []
-            ),
-            is_(equal_to(False))
-        )
-
-    def test__are_network_users_equal_in_flow(self):
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(
-                ["user1", "user2"],
-                [{"name": "user1"}, {"name": "user2"}]
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(
-                ["user1", "UnknownUser"],
-                [{"name": "user1"}, {"name": "user2"}]
-            ),
-            is_(equal_to(False))
-        )
-
-        # Test the case where the network users are set to ANY on the server
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(
-                ["user1"],
-                [ANY_OBJECT]
-            ),
-            is_(equal_to(False))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(
-                [],
-                [ANY_OBJECT]
-            ),
-            is_(equal_to(True))
-        )
-
-        # Test the case where the network users are missing from the server
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(
-                ["user1"],
-                []
-            ),
-            is_(equal_to(False))
-        )
+# The RequestedFlow fields read by IsEqualToFlowComparisonLogic.is_equal
+RequestedFlowStub = namedtuple(
+    "RequestedFlowStub", ["sources", "destinations", "network_services", "network_applications", "network_users"]
+)
 
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(
-                [],
-                []
-            ),
-            is_(equal_to(True))
-        )
+# Server side objects shared by several cases below
+SERVER_APPLICATIONS = [{"name": "app1"}, {"name": "app2"}]
+SERVER_USERS = [{"name": "user1"}, {"name": "user2"}]
+
+# (requested, server, expected) cases of each IsEqualToFlowComparisonLogic field comparison
+OBJECTS_CASES = [
+    (["objectName1", "objectName2"], [{"name": "objectName1"}, {"name": "objectName2"}], True),
+    (["objectName1"], [{"name": "UnknownObjectName"}], False),
+]
+NETWORK_APPLICATIONS_CASES = [
+    (["app1", "app2"], SERVER_APPLICATIONS, True),
+    (["app1", "app2", "app3"], SERVER_APPLICATIONS, False),
+    # The network applications are set to ANY on the server
+    ([], [ANY_NETWORK_APPLICATION], True),
+    (["app1"], [ANY_NETWORK_APPLICATION], False),
+    # The network applications are missing from the server
+    ([], [], True),
+    (["app1"], [], False),
+]
+NETWORK_USERS_CASES = [
+    (["user1", "user2"], SERVER_USERS, True),
+    (["user1", "UnknownUser"], SERVER_USERS, False),
+    # The network users are set to ANY on the server
+    (["user1"], [ANY_OBJECT], False),
+    ([], [ANY_OBJECT], True),
+    # The network users are missing from the server
+    (["user1"], [], False),
+    ([], [], True),
+]
+NETWORK_SERVICES_CASES = [
+    (["service1", "service2"], [{"name": "service2"}, {"name": "service1"}], True),
+    (["service2"], [{"name": "service1"}], False),
+    # Service names are compared as is, the protocol case is not normalized
+    (["TCP/80"], [{"name": "tcp/80"}], False),
+]
 
-    def test__are_network_services_equal_in_flow(self):
-        # TODO: Make sure that we have no issues with case sensitiveness of TCP/80 vs tcp/80 for any of the protocols
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_services_equal_in_flow(
-                ["service1", "service2"],
-                [{"name": "service2"}, {"name": "service1"}]
-            ),
-            is_(equal_to(True))
-        )
-
-        assert_that(
-            IsEqualToFlowComparisonLogic._are_network_services_equal_in_flow(
-                ["service2"],
-                [{"name": "service1"}],
-            ),
-            is_(equal_to(False))
-        )
 
-    @patch.object(IsEqualToFlowComparisonLogic, '_are_network_users_equal_in_flow')
-    @patch.object(IsEqualToFlowComparisonLogic, '_are_network_applications_equal_in_flow')
-    @patch.object(IsEqualToFlowComparisonLogic, '_are_network_services_equal_in_flow')
-    @patch.object(IsEqualToFlowComparisonLogic, '_are_destinations_equal_in_flow')
-    @patch.object(IsEqualToFlowComparisonLogic, '_are_sources_equal_in_flow')
-    def test__is_equal_all_fields_are_checked(
-            self,
-            m_are_sources_equal_in_flow,
-            m_are_destinations_equal_in_flow,
-            m_are_network_services_equal_in_flow,
-            m_are_network_applications_equal_in_flow,
-            m_are_network_users_equal_in_flow,
-    ):
-        requested_flow = Mock()
-        server_flow = Mock()
-        server_flow.__getitem__ = Mock()
-        IsEqualToFlowComparisonLogic.is_equal(requested_flow, server_flow)
+class TestIsEqualToFlowComparisonLogic(object):
 
-        m_are_sources_equal_in_flow.assert_called_once_with(
-            requested_flow.sources, server_flow['sources']
-        )
-        m_are_destinations_equal_in_flow.assert_called_once_with(
-            requested_flow.destinations, server_flow['destinations']
-        )
-        m_are_network_services_equal_in_flow.assert_called_once_with(
-            requested_flow.network_services, server_flow['services']
-        )
-        m_are_network_applications_equal_in_flow.assert_called_once_with(
-            requested_flow.network_applications, server_flow.get('networkApplications', [])
-        )
-        m_are_network_users_equal_in_flow.assert_called_once_with(
-            requested_flow.network_users, server_flow.get('networkUsers', [])
+    @pytest.mark.parametrize("requested,server,expected", OBJECTS_CASES)
+    def test__are_sources_equal_in_flow(self, requested, server, expected):
+        assert IsEqualToFlowComparisonLogic._are_sources_equal_in_flow(requested, server) is expected
+
+    @pytest.mark.parametrize("requested,server,expected", OBJECTS_CASES)
+    def test__are_destinations_equal_in_flow(self, requested, server, expected):
+        assert IsEqualToFlowComparisonLogic._are_destinations_equal_in_flow(requested, server) is expected
+
+    @pytest.mark.parametrize("requested,server,expected", NETWORK_APPLICATIONS_CASES)
+    def test__are_network_applications_equal_in_flow(self, requested, server, expected):
+        assert IsEqualToFlowComparisonLogic._are_network_applications_equal_in_flow(requested, server) is expected
+
+    @pytest.mark.parametrize("requested,server,expected", NETWORK_USERS_CASES)
+    def test__are_network_users_equal_in_flow(self, requested, server, expected):
+        assert IsEqualToFlowComparisonLogic._are_network_users_equal_in_flow(requested, server) is expected
+
+    @pytest.mark.parametrize("requested,server,expected", NETWORK_SERVICES_CASES)
+    def test__are_network_services_equal_in_flow(self, requested, server, expected):
+        assert IsEqualToFlowComparisonLogic._are_network_services_equal_in_flow(requested, server) is expected
+
+    def test__is_equal_all_fields_are_checked(self):
+        requested_flow = RequestedFlowStub(
+            sources=sentinel.requested_sources,
+            destinations=sentinel.requested_destinations,
+            network_services=sentinel.requested_services,
+            network_applications=sentinel.requested_applications,
+            network_users=sentinel.requested_users,
+        )
+        server_flow = {
+            'sources': sentinel.server_sources,
+            'destinations': sentinel.server_destinations,
+            'services': sentinel.server_services,
+            'networkApplications': sentinel.server_applications,
+            'networkUsers': sentinel.server_users,
+        }
+        with patch.multiple(
+            IsEqualToFlowComparisonLogic,
+            _are_sources_equal_in_flow=DEFAULT,
+            _are_destinations_equal_in_flow=DEFAULT,
+            _are_network_services_equal_in_flow=DEFAULT,
+            _are_network_applications_equal_in_flow=DEFAULT,
+            _are_network_users_equal_in_flow=DEFAULT,
+        ) as mocks:
+            IsEqualToFlowComparisonLogic.is_equal(requested_flow, server_flow)
+
+        mocks['_are_sources_equal_in_flow'].assert_called_once_with(
+            sentinel.requested_sources, sentinel.server_sources
+        )
+        mocks['_are_destinations_equal_in_flow'].assert_called_once_with(
+            sentinel.requested_destinations, sentinel.server_destinations
+        )
+        mocks['_are_network_services_equal_in_flow'].assert_called_once_with(
+            sentinel.requested_services, sentinel.server_services
+        )
+        mocks['_are_network_applications_equal_in_flow'].assert_called_once_with(
+            sentinel.requested_applications, sentinel.server_applications
+        )
+        mocks['_are_network_users_equal_in_flow'].assert_called_once_with(
+            sentinel.requested_users, sentinel.server_users
         )
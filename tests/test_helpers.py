@@ -1,8 +1,8 @@
 import logging
 
-import mock
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
 from algosec.helpers import (
     mount_adapter_on_session,
@@ -11,49 +11,74 @@ from algosec.helpers import (
     LogSOAPMessages,
 )
 
-@mock.patch("six.moves.builtins.super")
-def test_algosec_servers_http_adapter(mock_super, mocker):
-    adapter = AlgoSecServersHTTPAdapter()
-    adapter.send()
-    assert super.return_value.send.call_args == mocker.call(
-        timeout=(
-            AlgoSecServersHTTPAdapter.ALGOSEC_SERVER_CONNECT_TIMEOUT,
-            AlgoSecServersHTTPAdapter.ALGOSEC_SERVER_READ_TIMEOUT,
-        )
+# The keyword arguments the adapter is expected to forward on every send
+EXPECTED_SEND_KWARGS = {
+    "timeout": (
+        AlgoSecServersHTTPAdapter.ALGOSEC_SERVER_CONNECT_TIMEOUT,
+        AlgoSecServersHTTPAdapter.ALGOSEC_SERVER_READ_TIMEOUT,
     )
-    assert mock_super(AlgoSecServersHTTPAdapter, adapter).calls[0]
+}
+
+# Strings checked by is_ip_or_subnet, and whether each of them is a valid IP address or subnet
+IS_IP_OR_SUBNET_CASES = (
+    ("192.1.1.2", True),
+    ("10.0.0.0/24", True),
+    ("0.0.0.0", True),
+    ("10.0.0.1/24", False),
+    ("1.1.1.1/36", False),
+    ("256.265.256.256", False),
+    ("something", False),
+    # Non-ASCII object names, as text and as UTF-8 encoded bytes
+    (u"r\u00e9seau", False),
+    (b"r\xc3\xa9seau", False),
+)
+
+
+@pytest.fixture(scope="module")
+def adapter():
+    return AlgoSecServersHTTPAdapter()
+
+
+@pytest.fixture(scope="module")
+def session():
+    with requests.Session() as shared_session:
+        yield shared_session
+
+
+def test_algosec_servers_http_adapter(monkeypatch, adapter):
+    request = object()
+    sent_calls = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, *args, **kwargs: sent_calls.append((args, kwargs)))
+
+    adapter.send(request)
+
+    assert sent_calls == [((request,), EXPECTED_SEND_KWARGS)]
+
 
+def test_algosec_servers_http_adapter_timeout_override(monkeypatch):
+    class CustomTimeoutAdapter(AlgoSecServersHTTPAdapter):
+        ALGOSEC_SERVER_READ_TIMEOUT = 60
 
-def test_mount_algosec_adapter_on_session(mocker):
-    session = requests.Session()
-    mocker.spy(session, "mount")
-    mocker.patch.object(AlgoSecServersHTTPAdapter, "__init__", lambda x: None)
+    sent_kwargs = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, *args, **kwargs: sent_kwargs.append(kwargs))
+
+    CustomTimeoutAdapter().send(object())
+
+    assert sent_kwargs == [{"timeout": (AlgoSecServersHTTPAdapter.ALGOSEC_SERVER_CONNECT_TIMEOUT, 60)}]
+
+
+def test_mount_algosec_adapter_on_session(monkeypatch, adapter, session):
+    mount_calls = []
+    monkeypatch.setattr(session, "mount", lambda prefix, mounted: mount_calls.append((prefix, mounted)))
 
-    adapter = AlgoSecServersHTTPAdapter()
     mount_adapter_on_session(session, adapter)
 
-    # This whole nasty loop is just to verify that it was called with proper args
-    # I didn't find an elegant way to assert that the function is called twice with
-    # an *Instance* of AlgoSecServersHTTPAdapter.
-    for i, protocol in enumerate(["https", "http"]):
-        assert session.mount.call_args_list[i][0][0] == "{}://".format(protocol)
-        assert session.mount.call_args_list[i][0][1] == adapter
-
-
-@pytest.mark.parametrize(
-    "string,expected",
-    [
-        ("192.1.1.2", True),
-        ("10.0.0.0/24", True),
-        ("0.0.0.0", True),
-        ("10.0.0.1/24", False),
-        ("1.1.1.1/36", False),
-        ("256.265.256.256", False),
-        ("something", False),
-    ],
-)
+    assert mount_calls == [("https://", adapter), ("http://", adapter)]
+
+
+@pytest.mark.parametrize("string,expected", IS_IP_OR_SUBNET_CASES)
 def test_is_ip_or_subnet(string, expected):
-    assert is_ip_or_subnet(string) == expected
+    assert is_ip_or_subnet(string) is expected
 
 #TODO: check if LogSOAPMessages is necessary or it may be removed.
 
@@ -67,15 +92,18 @@ class MessageContext(object):
     pass
 
 
-class TestLogSOAPMessages(object):
-    @classmethod
-    def setup_class(cls):
-        logging.getLogger().setLevel(logging.DEBUG)
+@pytest.fixture(scope="class")
+def debug_root_logger():
+    """Log debug messages for the whole class and restore the previous root level afterwards"""
+    root_logger = logging.getLogger()
+    previous_level = root_logger.level
+    root_logger.setLevel(logging.DEBUG)
+    yield
+    root_logger.setLevel(previous_level)
 
-    @classmethod
-    def teardown_class(cls):
-        logging.getLogger().setLevel(logging.INFO)
 
+@pytest.mark.usefixtures("debug_root_logger")
+class TestLogSOAPMessages(object):
     @pytest.mark.parametrize("message", [b"some bits", True, 123, "some string"])
     def test_sending(self, caplog, message):
         context = MessageContext()
@@ -83,12 +111,11 @@ class TestLogSOAPMessages(object):
         logging_plugin = LogSOAPMessages()
         logging_plugin.sending(context)
 
-        log_records = list(caplog.records)
-        assert len(log_records) == 1
-        log_record = log_records[0]
+        assert len(caplog.records) == 1
+        log_record = caplog.records[0]
 
         assert log_record.levelno == logging.DEBUG
-        assert log_record.message == "Sending SOAP message: {}".format(str(message))
+        assert log_record.message == "Sending SOAP message: {}".format(message)
 
     @pytest.mark.parametrize("message", [b"some bits", True, 123, "some string"])
     def test_received(self, caplog, message):
@@ -98,9 +125,8 @@ class TestLogSOAPMessages(object):
         logging_plugin = LogSOAPMessages()
         logging_plugin.received(context)
 
-        log_records = list(caplog.records)
-        assert len(log_records) == 1
-        log_record = log_records[0]
+        assert len(caplog.records) == 1
+        log_record = caplog.records[0]
 
         assert log_record.levelno == logging.DEBUG
-        assert log_record.message == "Received SOAP message: {}".format(str(message))
+        assert log_record.message == "Received SOAP message: {}".format(message)
@@ -3,6 +3,14 @@ import pytest
 from algosec.errors import UnrecognizedAllowanceState
 from algosec.models import DeviceAllowanceState, RequestedFlow, ChangeRequestTrafficLine, ChangeRequestAction
 
+# State strings as reported by the server, and the DeviceAllowanceState each of them resolves to
+FROM_STRING_CASES = (
+    ("Partially Allowed", DeviceAllowanceState.PARTIALLY_BLOCKED),
+    ("blocked", DeviceAllowanceState.BLOCKED),
+    ("allowed", DeviceAllowanceState.ALLOWED),
+    ("Not routed", DeviceAllowanceState.NOT_ROUTED),
+)
+
 
 class TestRequestedFlow(object):
     def test_api_named_object(self):
@@ -38,12 +46,7 @@ class TestRequestedFlow(object):
 
 
 class TestDeviceAllowanceState(object):
-    @pytest.mark.parametrize("string,expected", [
-        ("Partially Allowed", DeviceAllowanceState.PARTIALLY_BLOCKED),
-        ("blocked", DeviceAllowanceState.BLOCKED),
-        ("allowed", DeviceAllowanceState.ALLOWED),
-        ("Not routed", DeviceAllowanceState.NOT_ROUTED),
-    ])
+    @pytest.mark.parametrize("string,expected", FROM_STRING_CASES)
     def test_from_string(self, string, expected):
         # Make sure we have no case sensitivity
         assert DeviceAllowanceState.from_string(string) == expected
@@ -0,0 +1,32 @@
+"""Micro benchmarks for the helpers that run on every object of a request.
+
+The tests run as plain tests in the regular suite, CI does not measure them. To measure them run
+``pytest tests/test_perf.py --codspeed`` with a recent pytest-codspeed, or under the CodSpeed runner
+with ``--codspeed-mode=instrumentation`` for instruction counts that are stable across machines.
+"""
+import pytest
+
+from algosec.helpers import is_ip_or_subnet
+from algosec.models import DeviceAllowanceState
+
+BATCH_SIZE = 10000
+
+# Built at import time so that only the calls themselves are measured.
+# Object names and IP addresses are mixed, just like the sources and destinations of a flow.
+IS_IP_OR_SUBNET_INPUTS = ["192.1.1.2/24", "10.0.0.0/24", "10.0.0.1", "web-servers"] * (BATCH_SIZE // 4)
+# The states are given both in the enum's wording and in the server's "Partially Allowed" one.
+ALLOWANCE_STATE_INPUTS = [
+    "Allowed", "Blocked", "Partially Blocked", "Partially Allowed", "Not Routed",
+] * (BATCH_SIZE // 5)
+
+
+@pytest.mark.benchmark
+def test_is_ip_or_subnet_bulk():
+    results = [is_ip_or_subnet(string) for string in IS_IP_OR_SUBNET_INPUTS]
+    assert results.count(True) == BATCH_SIZE // 4 * 2
+
+
+@pytest.mark.benchmark
+def test_device_allowance_state_from_string_bulk():
+    results = [DeviceAllowanceState.from_string(string) for string in ALLOWANCE_STATE_INPUTS]
+    assert set(results) == set(DeviceAllowanceState)